@@ -5,10 +5,12 @@
 .envファイルからRedmineの接続情報を取得します。
 """
 
+import functools
 import os
+import sys
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import NamedTuple
 
 
 class ConfigError(Exception):
@@ -16,10 +18,14 @@ class ConfigError(Exception):
     pass
 
 
-class RedmineConfig(NamedTuple):
+@dataclass(frozen=True, slots=True)
+class RedmineConfig:
     """
     Redmine設定情報を格納するデータクラス
-    
+
+    frozen + slotsによりインスタンスは不変かつ省メモリで、
+    ハッシュ可能なためキャッシュの値としても安全に扱えます。
+
     Attributes:
         url (str): RedmineサーバーのURL
         api_key (str): Redmine API キー
@@ -39,50 +45,96 @@ class ConfigManager:
     def load_config() -> RedmineConfig:
         """
         .envファイルから設定を読み込みます。
-        
+
+        環境変数が既に設定されている場合は.envの再パースを省略し、
+        .envファイルのパース結果は更新日時をキーにキャッシュされます。
+
         Returns:
             RedmineConfig: Redmine接続設定
-            
+
         Raises:
             ConfigError: 設定ファイルが見つからない、または必要な設定が不足している場合
         """
+        # 環境変数が揃っていれば.envの読み込み自体が不要
+        redmine_url = os.getenv('REDMINE_URL')
+        redmine_api_key = os.getenv('REDMINE_API_KEY')
+
+        if redmine_url and redmine_api_key:
+            return ConfigManager._build_config(redmine_url, redmine_api_key)
+
         # プロジェクトルートの.envファイルを探す
         env_path = Path('.env')
-        
+
         if not env_path.exists():
             raise ConfigError(
                 ".env file not found. Please create a .env file based on .env.example"
             )
-        
+
+        # mtimeをキーにキャッシュするため、.envが編集された場合のみ再パースされる
+        return ConfigManager._load_env_file(env_path.stat().st_mtime_ns)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_env_file(mtime_ns: int) -> RedmineConfig:
+        """
+        .envファイルをパースして設定を構築します（mtime単位でキャッシュ）。
+
+        Args:
+            mtime_ns (int): .envファイルの更新日時（キャッシュキー）
+
+        Returns:
+            RedmineConfig: Redmine接続設定
+
+        Raises:
+            ConfigError: 必要な設定が不足している場合
+        """
         # .envファイルを読み込み
-        load_dotenv(env_path)
-        
+        load_dotenv(Path('.env'))
+
         # 必要な環境変数を取得
         redmine_url = os.getenv('REDMINE_URL')
         redmine_api_key = os.getenv('REDMINE_API_KEY')
-        
+
         # 設定値の検証
         if not redmine_url:
             raise ConfigError(
                 "REDMINE_URL is not set in .env file. "
                 "Please set your Redmine server URL."
             )
-        
+
         if not redmine_api_key:
             raise ConfigError(
                 "REDMINE_API_KEY is not set in .env file. "
                 "Please set your Redmine API key."
             )
-        
+
+        return ConfigManager._build_config(redmine_url, redmine_api_key)
+
+    @staticmethod
+    def _build_config(redmine_url: str, redmine_api_key: str) -> RedmineConfig:
+        """
+        設定値の形式を検証してRedmineConfigを構築します。
+
+        Args:
+            redmine_url (str): RedmineサーバーのURL
+            redmine_api_key (str): Redmine API キー
+
+        Returns:
+            RedmineConfig: Redmine接続設定
+
+        Raises:
+            ConfigError: URLの形式が無効な場合
+        """
         # URLの形式を簡単にチェック
         if not (redmine_url.startswith('http://') or redmine_url.startswith('https://')):
             raise ConfigError(
                 f"Invalid REDMINE_URL format: {redmine_url}. "
                 "URL must start with http:// or https://"
             )
-        
+
         return RedmineConfig(
-            url=redmine_url.strip(),
+            # URLは各リクエストのプレフィックスとして使い回されるためintern
+            url=sys.intern(redmine_url.strip()),
             api_key=redmine_api_key.strip()
         )
     
@@ -5,10 +5,25 @@
 ディレクトリ管理を担当します。
 """
 
+import gzip
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+# orjsonが利用可能な場合は高速なシリアライズに使用する
+# （未インストール環境では標準ライブラリのjsonにフォールバック）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstd圧縮は任意依存（--compress zstd 使用時のみ必要）
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 class FileManager:
@@ -18,16 +33,61 @@ class FileManager:
     チケット情報のJSONファイルへの保存とディレクトリ作成を行います。
     """
     
-    def __init__(self, output_dir: str):
+    # 圧縮方式ごとのファイル拡張子
+    _SUFFIXES = {
+        'none': '.json',
+        'gzip': '.json.gz',
+        'zstd': '.json.zst'
+    }
+
+    def __init__(
+        self,
+        output_dir: str,
+        compress: str = 'none',
+        ndjson: bool = False,
+        pretty: bool = False
+    ):
         """
         FileManagerを初期化します。
-        
+
         Args:
             output_dir (str): 出力先のベースディレクトリパス
+            compress (str): チケットJSONの圧縮方式（'none', 'gzip', 'zstd'）
+            ndjson (bool): Trueの場合、チケットごとの個別ファイルではなく
+                          issues.ndjsonへの追記モードで保存
+            pretty (bool): Trueの場合、インデント・キーソート付きで整形して保存
+                          （人間がdiffする用途向け。デフォルトはコンパクト出力）
+
+        Raises:
+            ValueError: 圧縮方式が無効、または必要なライブラリが未インストールの場合
         """
+        if compress not in self._SUFFIXES:
+            raise ValueError(f"Invalid compress mode: {compress}")
+        if compress == 'zstd' and zstandard is None:
+            raise ValueError(
+                "zstd compression requires the 'zstandard' package. "
+                "Please install it with: pip install zstandard"
+            )
+        if ndjson and compress != 'none':
+            raise ValueError("--ndjson cannot be combined with --compress")
+
         self.output_dir = Path(output_dir)
         self.issues_dir = self.output_dir / "issues"
         self.attachments_dir = self.output_dir / "attachments"
+        self.compress = compress
+        self._suffix = self._SUFFIXES[compress]
+        self.ndjson = ndjson
+        self.pretty = pretty
+        self._ndjson_path = self.issues_dir / "issues.ndjson"
+
+        # パス生成のホットパス用に文字列プレフィックスを事前計算しておく
+        # （Pathの__truediv__はチケット数が多いと無視できないコストになる。
+        # Pathは公開APIの境界でのみ使用する）
+        self._issues_prefix = str(self.issues_dir) + os.sep
+        self._attachments_prefix = str(self.attachments_dir) + os.sep
+        self._ndjson_fp = None
+        # 複数スレッドからの追記を直列化するためのロック
+        self._ndjson_lock = threading.Lock()
     
     def ensure_directories_exist(self) -> None:
         """
@@ -44,41 +104,152 @@ class FileManager:
         except OSError as e:
             raise OSError(f"Failed to create directories: {str(e)}")
     
-    def save_issue_json(self, issue_id: int, issue_data: Dict[str, Any]) -> str:
+    def save_issue_json(
+        self,
+        issue_id: int,
+        issue_data: Dict[str, Any],
+        skip_existing: bool = False
+    ) -> Optional[str]:
         """
         チケット情報をJSONファイルとして保存します。
-        
+
         Args:
             issue_id (int): チケットID
             issue_data (Dict[str, Any]): 保存するチケット情報
-            
+            skip_existing (bool): Trueの場合、既存ファイルを上書きせずスキップ
+                                 （NDJSONモードでは無効）
+
         Returns:
-            str: 保存されたファイルのパス
-            
+            Optional[str]: 保存されたファイルのパス。
+                          既存ファイルのためスキップした場合はNone。
+
         Raises:
             OSError: ファイルの保存に失敗した場合
         """
+        # NDJSONモード: 個別ファイルではなく追記専用ファイルに1行書き込む
+        # （open/write/closeのメタデータ操作がチケットごとに発生しない）
+        if self.ndjson:
+            line = self._serialize_compact(issue_data) + b'\n'
+            with self._ndjson_lock:
+                if self._ndjson_fp is None:
+                    self._ndjson_fp = open(self._ndjson_path, 'ab')
+                self._ndjson_fp.write(line)
+            return str(self._ndjson_path)
+
         # ファイルパスを生成
-        file_path = self.issues_dir / f"{issue_id}.json"
-        
+        file_path = self._issues_prefix + f"{issue_id}{self._suffix}"
+
+        # skip_existing時はstat1回で既存判定する
+        # （下のアトミックなrenameは排他作成モードと両立しないため）
+        if skip_existing and os.path.exists(file_path):
+            return None
+
         try:
-            # JSONファイルとして整形して保存
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    issue_data, 
-                    f, 
-                    ensure_ascii=False,  # 日本語文字を正しく保存
-                    indent=2,            # 読みやすい形式で整形
-                    sort_keys=True       # キーをソートして一貫性を保つ
-                )
-            
-            return str(file_path)
-            
+            data = self._serialize(issue_data)
+            data = self._compress_bytes(data)
+
+            # 一時ファイルに書いてからos.replaceでアトミックに置き換える
+            # （書き込み途中のクラッシュで壊れたJSONが残らず、
+            # --skip-existingが不完全なファイルを誤ってスキップしない）
+            tmp_path = f"{file_path}.tmp.{os.getpid()}"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, file_path)
+            except OSError:
+                # 失敗時は一時ファイルを残さない
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            return file_path
+
         except OSError as e:
             raise OSError(f"Failed to save issue {issue_id} to {file_path}: {str(e)}")
         except (TypeError, ValueError) as e:
             raise ValueError(f"Invalid JSON data for issue {issue_id}: {str(e)}")
-    
+
+    def _serialize(self, issue_data: Dict[str, Any]) -> bytes:
+        """
+        チケット情報をJSONのUTF-8バイト列にシリアライズします。
+
+        デフォルトはコンパクト出力（整形なし）です。インデントとキーソートは
+        シリアライズを数倍遅くしファイルも3割ほど大きくなるため、
+        人間がdiffする用途でのみ--pretty（self.pretty）で有効化します。
+
+        Args:
+            issue_data (Dict[str, Any]): シリアライズするチケット情報
+
+        Returns:
+            bytes: JSONのUTF-8バイト列
+        """
+        if not self.pretty:
+            return self._serialize_compact(issue_data)
+
+        if orjson is not None:
+            # orjsonはUTF-8のbytesを直接出力する
+            return orjson.dumps(
+                issue_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+
+        return json.dumps(
+            issue_data,
+            ensure_ascii=False,  # 日本語文字を正しく保存
+            indent=2,            # 読みやすい形式で整形
+            sort_keys=True       # キーをソートして一貫性を保つ
+        ).encode('utf-8')
+
+    def _serialize_compact(self, issue_data: Dict[str, Any]) -> bytes:
+        """
+        チケット情報を1行のコンパクトなJSONバイト列にシリアライズします。
+
+        Args:
+            issue_data (Dict[str, Any]): シリアライズするチケット情報
+
+        Returns:
+            bytes: 改行を含まないJSONのUTF-8バイト列
+        """
+        if orjson is not None:
+            return orjson.dumps(issue_data, option=orjson.OPT_NON_STR_KEYS)
+
+        return json.dumps(issue_data, ensure_ascii=False).encode('utf-8')
+
+    def close(self) -> None:
+        """
+        保持しているファイルハンドルを閉じ、残った一時ファイルを掃除します。
+        """
+        with self._ndjson_lock:
+            if self._ndjson_fp is not None:
+                self._ndjson_fp.close()
+                self._ndjson_fp = None
+
+        # 過去のクラッシュ等で残った書きかけの一時ファイルを削除する
+        for tmp_path in self.issues_dir.glob('*.tmp.*'):
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _compress_bytes(self, data: bytes) -> bytes:
+        """
+        設定された圧縮方式でバイト列を圧縮します。
+
+        Args:
+            data (bytes): 圧縮するバイト列
+
+        Returns:
+            bytes: 圧縮後のバイト列（'none'の場合はそのまま）
+        """
+        if self.compress == 'gzip':
+            return gzip.compress(data, compresslevel=6)
+        if self.compress == 'zstd':
+            # レベル3は圧縮速度と圧縮率のバランスが良く、実質タダに近い
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return data
+
     def get_issue_file_path(self, issue_id: int) -> str:
         """
         指定されたチケットIDのファイルパスを取得します。
@@ -89,8 +260,8 @@ class FileManager:
         Returns:
             str: ファイルパス
         """
-        return str(self.issues_dir / f"{issue_id}.json")
-    
+        return self._issues_prefix + f"{issue_id}{self._suffix}"
+
     def file_exists(self, issue_id: int) -> bool:
         """
         指定されたチケットIDのファイルが既に存在するかチェックします。
@@ -101,9 +272,34 @@ class FileManager:
         Returns:
             bool: ファイルが存在する場合True
         """
-        file_path = self.issues_dir / f"{issue_id}.json"
-        return file_path.exists() and file_path.is_file()
+        return os.path.isfile(self._issues_prefix + f"{issue_id}{self._suffix}")
     
+    def existing_issue_ids(self) -> frozenset:
+        """
+        issuesディレクトリに保存済みのチケットIDの集合を取得します。
+
+        1回のディレクトリ走査（os.scandir）で全IDを収集するため、
+        --skip-existing時にチケットごとのstat()を発行せずに済みます。
+
+        Returns:
+            frozenset: 保存済みチケットIDの集合
+        """
+        suffix_len = len(self._suffix)
+        ids = set()
+
+        try:
+            with os.scandir(self.issues_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self._suffix) and entry.is_file():
+                        stem = entry.name[:-suffix_len]
+                        if stem.isdigit():
+                            ids.add(int(stem))
+        except FileNotFoundError:
+            # 出力ディレクトリが未作成の場合は保存済みチケットなし
+            pass
+
+        return frozenset(ids)
+
     def get_attachment_dir_path(self, issue_id: int) -> str:
         """
         指定されたチケットIDの添付ファイル用ディレクトリパスを取得します。
@@ -114,7 +310,7 @@ class FileManager:
         Returns:
             str: 添付ファイル用ディレクトリパス
         """
-        return str(self.attachments_dir / str(issue_id))
+        return self._attachments_prefix + str(issue_id)
     
     def get_attachment_file_path(self, issue_id: int, filename: str) -> str:
         """
@@ -127,4 +323,4 @@ class FileManager:
         Returns:
             str: 添付ファイルの完全なパス
         """
-        return str(self.attachments_dir / str(issue_id) / filename)
+        return self._attachments_prefix + f"{issue_id}{os.sep}{filename}"
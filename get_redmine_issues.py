@@ -10,17 +10,21 @@ Redmine APIを使用してチケット情報（コメント履歴を含む）を
     python get_redmine_issues.py --output-dir /tmp/data 49121 49122 50000
 """
 
+from __future__ import annotations
+
 import argparse
+import concurrent.futures
 import sys
-import os
 from typing import List
 import logging
 
 from config import ConfigManager, ConfigError
-from redmine_client import RedmineClient, RedmineAPIError
-from file_manager import FileManager
 from history_manager import HistoryManager
 
+# redmine_client（requestsを読み込む）とfile_managerは起動コストが大きいため、
+# 実際にチケット取得を行う時点まで読み込みを遅延する
+# （--help / --show-history / --list-history-dates の起動を高速化）
+
 
 def setup_logging() -> None:
     """
@@ -88,6 +92,32 @@ def parse_arguments() -> argparse.Namespace:
         action='store_true',
         help='添付ファイルをダウンロードしない'
     )
+
+    parser.add_argument(
+        '--compress',
+        choices=['none', 'gzip', 'zstd'],
+        default='none',
+        help='チケットJSONの圧縮方式（デフォルト: none、zstdはzstandardパッケージが必要）'
+    )
+
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='JSONをインデント・キーソート付きで整形して保存（デフォルトはコンパクト出力）'
+    )
+
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='チケットごとの個別ファイルではなくissues.ndjsonに追記保存'
+    )
+
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='httpxベースの非同期クライアントで取得（httpxパッケージが必要）'
+    )
     
     # 履歴表示のオプション
     parser.add_argument(
@@ -115,44 +145,48 @@ def parse_arguments() -> argparse.Namespace:
 
 
 def process_issue(
-    client: RedmineClient, 
-    file_manager: FileManager, 
+    client: RedmineClient,
+    file_manager: FileManager,
     issue_id: int,
     skip_existing: bool = False,
-    download_attachments: bool = True
+    download_attachments: bool = True,
+    issue_data: dict = None
 ) -> bool:
     """
     単一のチケットを処理します。
-    
+
     Args:
         client (RedmineClient): Redmine APIクライアント
         file_manager (FileManager): ファイル管理オブジェクト
         issue_id (int): 処理するチケットID
         skip_existing (bool): 既存ファイルをスキップするかどうか
         download_attachments (bool): 添付ファイルをダウンロードするかどうか
-        
+        issue_data (dict): 一括取得済みのチケット情報。Noneの場合は個別に取得
+
     Returns:
         bool: 処理が成功した場合True
     """
     logger = logging.getLogger(__name__)
-    
+
+    # 遅延インポート（main()で読み込み済みのためキャッシュから解決される）
+    from redmine_client import RedmineAPIError
+
     try:
-        # 既存ファイルのチェック
-        if skip_existing and file_manager.file_exists(issue_id):
-            logger.info(f"Issue {issue_id}: ファイルが既に存在するためスキップします")
-            return True
-        
-        logger.info(f"Issue {issue_id}: チケット情報を取得中...")
-        
-        # チケット情報を取得
-        issue_data = client.get_issue(issue_id)
-        
+        # 一括取得で得られなかった場合や、一覧エンドポイントがjournalsを
+        # 返さないRedmineバージョンの場合は個別に取得する
+        if issue_data is None or 'journals' not in issue_data.get('issue', {}):
+            logger.info(f"Issue {issue_id}: チケット情報を取得中...")
+            issue_data = client.get_issue(issue_id)
+
         if issue_data is None:
             logger.error(f"Issue {issue_id}: チケットが見つかりません (404 Not Found)")
             return False
-        
-        # ファイルに保存
-        saved_path = file_manager.save_issue_json(issue_id, issue_data)
+
+        # ファイルに保存（EAFP: 既存ファイルの検出はsave_issue_json側で行う）
+        saved_path = file_manager.save_issue_json(issue_id, issue_data, skip_existing=skip_existing)
+        if saved_path is None:
+            logger.info(f"Issue {issue_id}: ファイルが既に存在するためスキップします")
+            return True
         logger.info(f"Issue {issue_id}: 保存完了 -> {saved_path}")
         
         # 添付ファイルのダウンロード処理
@@ -162,32 +196,44 @@ def process_issue(
                 logger.info(f"Issue {issue_id}: {len(attachments)} 個の添付ファイルをダウンロード中...")
                 download_successful = 0
                 download_failed = 0
-                
+
+                valid_attachments = []
                 for attachment in attachments:
-                    attachment_id = attachment.get('id')
-                    filename = attachment.get('filename', f'attachment_{attachment_id}')
-                    
-                    if attachment_id:
-                        file_path = file_manager.get_attachment_file_path(issue_id, filename)
-                        
-                        # 既にファイルが存在する場合はスキップ
-                        if os.path.exists(file_path):
-                            logger.info(f"  📎 {filename} (既に存在するためスキップ)")
-                            download_successful += 1
-                            continue
-                        
-                        logger.info(f"  📎 {filename} をダウンロード中...")
-                        
-                        if client.download_attachment(attachment_id, file_path):
-                            logger.info(f"  ✅ {filename} ダウンロード完了")
-                            download_successful += 1
-                        else:
-                            logger.warning(f"  ❌ {filename} ダウンロード失敗")
-                            download_failed += 1
+                    if attachment.get('id'):
+                        valid_attachments.append(attachment)
                     else:
                         logger.warning(f"  ⚠️  添付ファイル情報が不正です: {attachment}")
                         download_failed += 1
-                
+
+                def download_one(attachment: dict) -> tuple:
+                    attachment_id = attachment['id']
+                    filename = attachment.get('filename', f'attachment_{attachment_id}')
+                    file_path = file_manager.get_attachment_file_path(issue_id, filename)
+                    # 既存ファイルの検出と鮮度判定はdownload_attachment側で行う
+                    return filename, client.download_attachment(
+                        attachment_id, file_path, attachment.get('filesize')
+                    )
+
+                # 各添付ファイルは独立したI/Oのため並列にダウンロードする
+                if valid_attachments:
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as attachment_executor:
+                        download_futures = [
+                            attachment_executor.submit(download_one, attachment)
+                            for attachment in valid_attachments
+                        ]
+                        for download_future in concurrent.futures.as_completed(download_futures):
+                            filename, result = download_future.result()
+
+                            if result is None:
+                                logger.info(f"  📎 {filename} (既に存在するためスキップ)")
+                                download_successful += 1
+                            elif result:
+                                logger.info(f"  ✅ {filename} ダウンロード完了")
+                                download_successful += 1
+                            else:
+                                logger.warning(f"  ❌ {filename} ダウンロード失敗")
+                                download_failed += 1
+
                 if download_failed > 0:
                     logger.warning(f"Issue {issue_id}: 添付ファイル {download_failed}/{len(attachments)} 個のダウンロードに失敗しました")
                 else:
@@ -256,6 +302,10 @@ def main() -> int:
             return 0
         
         # 通常のチケット取得処理
+        # ここで初めて重量級モジュールを読み込む
+        from redmine_client import RedmineClient, RedmineAPIError
+        from file_manager import FileManager
+
         logger.info("Redmineチケット情報取得ツールを開始します")
         logger.info(f"対象チケットID: {args.issue_ids}")
         logger.info(f"出力先ディレクトリ: {args.output_dir}")
@@ -280,7 +330,12 @@ def main() -> int:
         logger.info("接続テスト成功")
         
         # ファイルマネージャーの初期化
-        file_manager = FileManager(args.output_dir)
+        file_manager = FileManager(
+            args.output_dir,
+            compress=args.compress,
+            ndjson=args.ndjson,
+            pretty=args.pretty
+        )
         file_manager.ensure_directories_exist()
         
         logger.info(f"出力ディレクトリを準備しました:")
@@ -294,16 +349,72 @@ def main() -> int:
         else:
             logger.info("添付ファイルのダウンロードは無効です (--no-attachments)")
         
-        # 各チケットを処理
         successful_count = 0
         failed_count = 0
-        
-        for issue_id in args.issue_ids:
-            if process_issue(client, file_manager, issue_id, args.skip_existing, download_attachments):
-                successful_count += 1
-            else:
-                failed_count += 1
-        
+
+        # 中断や例外でもNDJSONハンドルのクローズと一時ファイルの掃除が
+        # 必ず行われるようtry/finallyで囲む
+        try:
+            # --skip-existing時は1回のディレクトリ走査で既存IDを収集し、
+            # 保存済みチケットはHTTP取得の対象からも除外する
+            # （チケットごとのstat()が不要になり、NFS等でも1回の読み取りで済む）
+            pending_issue_ids = args.issue_ids
+            if args.skip_existing:
+                existing_ids = file_manager.existing_issue_ids()
+                pending_issue_ids = []
+                for issue_id in args.issue_ids:
+                    if issue_id in existing_ids:
+                        logger.info(f"Issue {issue_id}: ファイルが既に存在するためスキップします")
+                        successful_count += 1
+                    else:
+                        pending_issue_ids.append(issue_id)
+
+            if pending_issue_ids and args.use_async:
+                # 非同期モード: httpxのコネクションプール上でチケット処理を多重化する
+                import asyncio
+                from redmine_client_async import fetch_issues_async
+
+                logger.info("非同期モードでチケットを処理します")
+                async_successful, async_failed = asyncio.run(fetch_issues_async(
+                    config.url, config.api_key, file_manager, pending_issue_ids,
+                    args.skip_existing, download_attachments
+                ))
+                successful_count += async_successful
+                failed_count += async_failed
+
+            elif pending_issue_ids:
+                # 全チケットを事前に一括取得してHTTPラウンドトリップを削減する
+                # （失敗した場合は従来どおり個別取得にフォールバック）
+                logger.info("チケット情報を一括取得中...")
+                try:
+                    prefetched = client.get_issues_bulk(pending_issue_ids)
+                except RedmineAPIError as e:
+                    logger.warning(f"一括取得に失敗したため個別取得に切り替えます: {str(e)}")
+                    prefetched = {}
+
+                # 各チケットを処理
+                # ネットワークI/Oが支配的なためスレッドプールで並列化する
+                # （requests.Sessionはソケット待ちの間GILを解放するため効果が大きい）
+                max_workers = min(16, len(pending_issue_ids))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(
+                            process_issue, client, file_manager, issue_id,
+                            args.skip_existing, download_attachments,
+                            prefetched.get(issue_id)
+                        )
+                        for issue_id in pending_issue_ids
+                    ]
+                    for future in concurrent.futures.as_completed(futures):
+                        if future.result():
+                            successful_count += 1
+                        else:
+                            failed_count += 1
+
+        finally:
+            # 保持しているファイルハンドルを閉じる（NDJSONモード用）
+            file_manager.close()
+
         # 結果の表示
         logger.info("=" * 50)
         logger.info("処理結果:")
@@ -7,7 +7,7 @@
 
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, date
 from pathlib import Path
 from typing import List, Optional
 import logging
@@ -28,6 +28,11 @@ class HistoryManager:
         self.base_dir = Path(base_dir)
         self.history_dir = self.base_dir / "history"
         self.logger = logging.getLogger(__name__)
+
+        # 今日のログファイルの追記用ハンドルをキャッシュする
+        # （書き込みごとのmkdir + パス生成 + open/closeを省略）
+        self._log_fp = None
+        self._log_date = None
     
     def ensure_history_directory_exists(self) -> None:
         """
@@ -55,6 +60,41 @@ class HistoryManager:
         
         date_str = date.strftime("%Y%m%d")
         return self.history_dir / f"{date_str}.log"
+
+    def _get_log_fp(self):
+        """
+        今日のログファイルの追記用ハンドルを取得します（キャッシュ付き）。
+
+        日付が変わった場合は古いハンドルを閉じ、新しい日付のログファイルを
+        開き直します。
+
+        Returns:
+            TextIO: 追記モードで開かれたログファイル
+        """
+        today = date.today()
+
+        if self._log_fp is None or self._log_date != today:
+            self.close()
+            self.ensure_history_directory_exists()
+            self._log_fp = open(self.get_log_file_path(), 'a', encoding='utf-8')
+            self._log_date = today
+
+        return self._log_fp
+
+    def close(self) -> None:
+        """
+        保持しているログファイルハンドルを閉じます。
+        """
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+            self._log_date = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def log_command_execution(
         self, 
@@ -71,31 +111,28 @@ class HistoryManager:
             additional_info (Optional[str]): 追加情報（成功/失敗件数など）
         """
         try:
-            self.ensure_history_directory_exists()
-            
             # ログエントリの作成
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             status = "SUCCESS" if success else "FAILED"
-            
+
             # コマンドライン文字列の再構築
             command_line = " ".join(command_args)
-            
+
             # ログエントリの構築
             log_entry = f"[{timestamp}] {status}: {command_line}"
-            
+
             if additional_info:
                 log_entry += f" | {additional_info}"
-            
+
             log_entry += "\n"
-            
-            # ログファイルに追記
-            log_file_path = self.get_log_file_path()
-            
-            with open(log_file_path, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-            
-            self.logger.debug(f"コマンド履歴をログに記録しました: {log_file_path}")
-            
+
+            # キャッシュ済みハンドルに追記（flushで即時に永続化する）
+            log_fp = self._get_log_fp()
+            log_fp.write(log_entry)
+            log_fp.flush()
+
+            self.logger.debug(f"コマンド履歴をログに記録しました: {log_fp.name}")
+
         except Exception as e:
             self.logger.error(f"履歴ログの記録に失敗しました: {e}")
             # 履歴ログの失敗はメイン処理を停止させない
@@ -127,8 +164,10 @@ class HistoryManager:
             return []
         
         try:
-            with open(log_file_path, 'r', encoding='utf-8') as f:
-                return [line.rstrip('\n') for line in f.readlines()]
+            # readlines() + 内包表記の二重リスト生成を避け、
+            # 1回のread + C実装のsplitlines()で行リストを作る（\r\nにも対応）
+            with open(log_file_path, 'rb') as f:
+                return f.read().decode('utf-8').splitlines()
         except Exception as e:
             self.logger.error(f"履歴ログの読み取りに失敗しました: {e}")
             return []
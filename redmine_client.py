@@ -6,17 +6,55 @@ Redmine API クライアントモジュール
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, List
 import json
 import os
+from email.utils import formatdate
 from pathlib import Path
 
+# orjsonが利用可能な場合はレスポンスのパースに使用する
+# （未インストール環境では標準ライブラリのjsonにフォールバック）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class RedmineAPIError(Exception):
     """Redmine API関連のエラーを表すカスタム例外クラス"""
     pass
 
 
+# get_issueで毎回同じ辞書を生成しないためのモジュールレベル定数
+_INCLUDE_PARAMS = {'include': 'journals,attachments'}
+
+
+def extract_attachments(issue_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    チケットデータから添付ファイル情報を抽出します。
+
+    Args:
+        issue_data (Dict[str, Any]): チケット情報のJSON辞書
+
+    Returns:
+        List[Dict[str, Any]]: 添付ファイル情報のリスト
+    """
+    # 'in'チェックと'[]'参照の二重ルックアップを避けるためget()で一度だけ引く
+    issue = issue_data.get('issue') or {}
+
+    # チケット本体の添付ファイル
+    attachments = list(issue.get('attachments', ()))
+
+    # コメント（journals）の添付ファイル
+    extend = attachments.extend
+    for journal in issue.get('journals', ()):
+        extend(journal.get('attachments', ()))
+
+    return attachments
+
+
 class RedmineClient:
     """
     Redmine APIクライアントクラス
@@ -35,7 +73,27 @@ class RedmineClient:
         self.base_url = base_url.rstrip('/')  # 末尾のスラッシュを削除
         self.api_key = api_key
         self.session = requests.Session()
-        
+
+        # リクエストごとのf-string再構築を避けるためURLテンプレートを事前計算
+        # （%フォーマットは整数のみの埋め込みではf-stringより速い）
+        self._issue_url_tmpl = self.base_url + '/issues/%d.json'
+        self._attachment_url_tmpl = self.base_url + '/attachments/%d'
+        self._bulk_url = self.base_url + '/issues.json'
+
+        # コネクションプールを並列処理のワーカー数に合わせて拡大し、
+        # 一時的なエラーはリトライする（TCP/TLSハンドシェイクの再発生を防ぐ）
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
         # APIキーをヘッダーに設定
         self.session.headers.update({
             'X-Redmine-API-Key': self.api_key,
@@ -56,13 +114,11 @@ class RedmineClient:
         Raises:
             RedmineAPIError: API呼び出しでエラーが発生した場合
         """
-        url = f"{self.base_url}/issues/{issue_id}.json"
-        
-        # コメント情報と添付ファイル情報を含めるためのパラメータを追加
-        params = {'include': 'journals,attachments'}
-        
+        url = self._issue_url_tmpl % issue_id
+
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            # コメント情報と添付ファイル情報を含めるためのパラメータを追加
+            response = self.session.get(url, params=_INCLUDE_PARAMS, timeout=30)
             
             # チケットが存在しない場合
             if response.status_code == 404:
@@ -76,6 +132,9 @@ class RedmineClient:
                 )
             
             # JSONレスポンスをパース
+            # orjsonはbytesを直接パースできるため、str変換を省略できる
+            if orjson is not None:
+                return orjson.loads(response.content)
             return response.json()
             
         except requests.exceptions.Timeout:
@@ -95,6 +154,85 @@ class RedmineClient:
                 f"Invalid JSON response received for issue {issue_id}"
             )
     
+    def get_issues_bulk(self, issue_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        複数のチケット情報を一括取得します。
+
+        /issues.json のissue_idフィルタで100件単位にまとめて取得するため、
+        HTTPラウンドトリップがN回からceil(N/100)回に減ります。
+
+        注意: 本家Redmineの一覧エンドポイントはinclude=journalsに対応して
+        いません（journalsは個別取得エンドポイントのみ）。最初のチャンクで
+        journalsが含まれないことを検出した場合、残りの一括リクエストは
+        無駄になるため発行せず、そこまでの結果を返します。呼び出し側は
+        journalsを含まないチケットをget_issueで個別に再取得してください。
+
+        Args:
+            issue_ids (List[int]): 取得するチケットIDのリスト
+
+        Returns:
+            Dict[int, Dict[str, Any]]: チケットIDをキーとし、get_issueと同じ
+                                      {'issue': {...}} 形式を値とする辞書。
+                                      存在しないIDは含まれません。
+
+        Raises:
+            RedmineAPIError: API呼び出しでエラーが発生した場合
+        """
+        url = self._bulk_url
+        results: Dict[int, Dict[str, Any]] = {}
+
+        # Redmine APIの1リクエストあたりの上限に合わせて100件ずつ取得
+        for start in range(0, len(issue_ids), 100):
+            chunk = issue_ids[start:start + 100]
+            params = {
+                'issue_id': ','.join(map(str, chunk)),
+                'include': 'journals,attachments',
+                'status_id': '*',  # 終了済みチケットも対象に含める
+                'limit': 100
+            }
+
+            try:
+                response = self.session.get(url, params=params, timeout=60)
+
+                if not response.ok:
+                    raise RedmineAPIError(
+                        f"Bulk API request failed with status {response.status_code}: "
+                        f"{response.text}"
+                    )
+
+                if orjson is not None:
+                    payload = orjson.loads(response.content)
+                else:
+                    payload = response.json()
+
+            except requests.exceptions.Timeout:
+                raise RedmineAPIError("Timeout occurred while bulk-fetching issues")
+
+            except requests.exceptions.ConnectionError:
+                raise RedmineAPIError(
+                    "Connection error occurred while bulk-fetching issues. "
+                    "Please check your network connection and Redmine URL."
+                )
+
+            except requests.exceptions.RequestException as e:
+                raise RedmineAPIError(f"Request error occurred: {str(e)}")
+
+            except json.JSONDecodeError:
+                raise RedmineAPIError("Invalid JSON response received for bulk issue fetch")
+
+            issues = payload.get('issues', [])
+            for issue in issues:
+                # get_issueの戻り値と同じ形式に揃える
+                results[issue['id']] = {'issue': issue}
+
+            # 一覧エンドポイントがjournalsを返さないサーバーでは一括取得の
+            # 結果がすべて個別取得にフォールバックされるため、残りのチャンク
+            # を取得しても無駄になる。最初のチャンクで検出して打ち切る
+            if issues and 'journals' not in issues[0]:
+                break
+
+        return results
+
     def test_connection(self) -> bool:
         """
         Redmineサーバーへの接続とAPIキーの有効性をテストします。
@@ -110,52 +248,96 @@ class RedmineClient:
         except requests.exceptions.RequestException:
             return False
     
-    def download_attachment(self, attachment_id: int, file_path: str) -> bool:
+    def download_attachment(
+        self,
+        attachment_id: int,
+        file_path: str,
+        filesize: Optional[int] = None
+    ) -> Optional[bool]:
         """
         指定された添付ファイルをダウンロードします。
-        
+
+        ローカルに同名ファイルが存在する場合:
+        - サイズがfilesize（チケット情報の添付メタデータ）と一致すれば
+          変更なしとみなし、HTTPリクエストを発行せずにスキップします
+        - 一致しない場合はIf-Modified-Since付きの条件付きGETを発行し、
+          304 Not Modifiedならスキップ、更新されていれば再ダウンロードします
+
         Args:
             attachment_id (int): 添付ファイルのID
             file_path (str): 保存先のファイルパス
-            
+            filesize (Optional[int]): サーバー側の添付ファイルサイズ（バイト）
+
         Returns:
-            bool: ダウンロードが成功した場合True、失敗した場合False
+            Optional[bool]: ダウンロードが成功した場合True、失敗した場合False。
+                           ファイルが最新のためスキップした場合はNone。
         """
-        url = f"{self.base_url}/attachments/{attachment_id}"
-        
+        url = self._attachment_url_tmpl % attachment_id
+
+        # ディレクトリが存在しない場合は作成
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        headers = None
         try:
-            response = self.session.get(url, timeout=60, stream=True)
-            
-            if not response.ok:
-                print(f"  ⚠️  添付ファイル {attachment_id} のダウンロードに失敗しました (HTTP {response.status_code})")
-                return False
-            
-            # ディレクトリが存在しない場合は作成
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # ファイルを保存
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            return True
-            
-        except requests.exceptions.Timeout:
-            print(f"  ⚠️  添付ファイル {attachment_id} のダウンロードがタイムアウトしました")
-            return False
-        
-        except requests.exceptions.ConnectionError:
-            print(f"  ⚠️  添付ファイル {attachment_id} のダウンロード中に接続エラーが発生しました")
-            return False
-        
-        except requests.exceptions.RequestException as e:
-            print(f"  ⚠️  添付ファイル {attachment_id} のダウンロード中にエラーが発生しました: {str(e)}")
-            return False
-        
-        except OSError as e:
-            print(f"  ⚠️  添付ファイル {attachment_id} の保存中にエラーが発生しました: {str(e)}")
-            return False
+            local_stat = os.stat(file_path)
+        except OSError:
+            local_stat = None
+
+        if local_stat is not None:
+            if filesize is not None and local_stat.st_size == filesize:
+                # サイズが一致＝変更なしとみなしダウンロード済み扱い
+                return None
+            # サイズ不一致（または不明）: サーバー側が更新された場合のみ取得する
+            headers = {'If-Modified-Since': formatdate(local_stat.st_mtime, usegmt=True)}
+
+        success = False
+        opened = False
+        try:
+            try:
+                response = self.session.get(url, timeout=60, stream=True, headers=headers)
+
+                if response.status_code == 304:
+                    # サーバー側に更新なし
+                    return None
+
+                if not response.ok:
+                    print(f"  ⚠️  添付ファイル {attachment_id} のダウンロードに失敗しました (HTTP {response.status_code})")
+                else:
+                    # ファイルを保存
+                    # 1MiB単位でストリーム転送し、Pythonレベルのループ回数と
+                    # write()システムコールを削減する
+                    # （iter_content経由だと転送中のurllib3例外が
+                    # requests.exceptions.RequestExceptionにラップされる）
+                    with open(file_path, 'wb') as f:
+                        opened = True
+                        if hasattr(os, 'posix_fadvise'):
+                            # 逐次書き込みであることをカーネルにヒントする
+                            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                        for chunk in response.iter_content(chunk_size=1024 * 1024):
+                            f.write(chunk)
+                    success = True
+
+            except requests.exceptions.Timeout:
+                print(f"  ⚠️  添付ファイル {attachment_id} のダウンロードがタイムアウトしました")
+
+            except requests.exceptions.ConnectionError:
+                print(f"  ⚠️  添付ファイル {attachment_id} のダウンロード中に接続エラーが発生しました")
+
+            except requests.exceptions.RequestException as e:
+                print(f"  ⚠️  添付ファイル {attachment_id} のダウンロード中にエラーが発生しました: {str(e)}")
+
+            except OSError as e:
+                print(f"  ⚠️  添付ファイル {attachment_id} の保存中にエラーが発生しました: {str(e)}")
+
+        finally:
+            if opened and not success:
+                # 書きかけのファイルを残すと次回サイズ一致で誤スキップしうるため削除
+                try:
+                    os.unlink(file_path)
+                except OSError:
+                    pass
+
+        return success
     
     def get_attachments_from_issue(self, issue_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -167,16 +349,4 @@ class RedmineClient:
         Returns:
             List[Dict[str, Any]]: 添付ファイル情報のリスト
         """
-        attachments = []
-        
-        # チケット本体の添付ファイル
-        if 'issue' in issue_data and 'attachments' in issue_data['issue']:
-            attachments.extend(issue_data['issue']['attachments'])
-        
-        # コメント（journals）の添付ファイル
-        if 'issue' in issue_data and 'journals' in issue_data['issue']:
-            for journal in issue_data['issue']['journals']:
-                if 'attachments' in journal:
-                    attachments.extend(journal['attachments'])
-        
-        return attachments
+        return extract_attachments(issue_data)
@@ -0,0 +1,315 @@
+"""
+Redmine API 非同期クライアントモジュール
+
+このモジュールは、httpxベースの非同期Redmine APIクライアントと、
+チケット一括取得の非同期実行処理を提供します。
+単一の接続プール上で多数のリクエストを多重化するため、
+スレッドプールよりも少ないオーバーヘッドで高い並列度を出せます。
+
+httpxは任意依存です（--async使用時のみ必要）。
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from email.utils import formatdate
+from typing import Dict, Any, Optional, Tuple, List
+
+from redmine_client import RedmineAPIError, _INCLUDE_PARAMS, extract_attachments
+
+# httpxは任意依存（--async使用時のみ必要）
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class AsyncRedmineClient:
+    """
+    httpxベースの非同期Redmine APIクライアントクラス
+
+    h2パッケージが利用可能な場合はHTTP/2で単一コネクション上に
+    リクエストを多重化します（利用不可の場合はHTTP/1.1のkeep-alive）。
+    """
+
+    def __init__(self, base_url: str, api_key: str, max_connections: int = 50):
+        """
+        AsyncRedmineClientを初期化します。
+
+        Args:
+            base_url (str): RedmineサーバーのベースURL
+            api_key (str): Redmine API キー
+            max_connections (int): 同時接続数の上限
+
+        Raises:
+            RedmineAPIError: httpxがインストールされていない場合
+        """
+        if httpx is None:
+            raise RedmineAPIError(
+                "--async requires the 'httpx' package. "
+                "Please install it with: pip install httpx"
+            )
+
+        self.base_url = base_url.rstrip('/')  # 末尾のスラッシュを削除
+        self.api_key = api_key
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        headers = {
+            'X-Redmine-API-Key': self.api_key,
+            'Content-Type': 'application/json'
+        }
+
+        try:
+            self.client = httpx.AsyncClient(http2=True, limits=limits, headers=headers, timeout=60)
+        except ImportError:
+            # h2パッケージ未インストール時はHTTP/1.1にフォールバック
+            self.client = httpx.AsyncClient(http2=False, limits=limits, headers=headers, timeout=60)
+
+    async def get_issue(self, issue_id: int) -> Optional[Dict[str, Any]]:
+        """
+        指定されたチケットIDの情報を取得します。
+
+        Args:
+            issue_id (int): 取得するチケットのID
+
+        Returns:
+            Optional[Dict[str, Any]]: チケット情報のJSON辞書。
+                                    チケットが存在しない場合はNone。
+
+        Raises:
+            RedmineAPIError: API呼び出しでエラーが発生した場合
+        """
+        url = f"{self.base_url}/issues/{issue_id}.json"
+
+        try:
+            response = await self.client.get(url, params=_INCLUDE_PARAMS)
+        except httpx.HTTPError as e:
+            raise RedmineAPIError(f"Request error occurred: {str(e)}")
+
+        # チケットが存在しない場合
+        if response.status_code == 404:
+            return None
+
+        # その他のHTTPエラー
+        if response.is_error:
+            raise RedmineAPIError(
+                f"API request failed with status {response.status_code}: "
+                f"{response.text}"
+            )
+
+        try:
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        except ValueError:
+            raise RedmineAPIError(
+                f"Invalid JSON response received for issue {issue_id}"
+            )
+
+    async def download_attachment(
+        self,
+        attachment_id: int,
+        file_path: str,
+        filesize: Optional[int] = None
+    ) -> Optional[bool]:
+        """
+        指定された添付ファイルをダウンロードします。
+
+        スキップ判定は同期版（RedmineClient.download_attachment）と同じで、
+        サイズ一致→リクエストなしでスキップ、不一致→条件付きGETです。
+
+        Args:
+            attachment_id (int): 添付ファイルのID
+            file_path (str): 保存先のファイルパス
+            filesize (Optional[int]): サーバー側の添付ファイルサイズ（バイト）
+
+        Returns:
+            Optional[bool]: ダウンロードが成功した場合True、失敗した場合False。
+                           ファイルが最新のためスキップした場合はNone。
+        """
+        url = f"{self.base_url}/attachments/{attachment_id}"
+
+        # ディレクトリが存在しない場合は作成
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        headers = None
+        try:
+            local_stat = os.stat(file_path)
+        except OSError:
+            local_stat = None
+
+        if local_stat is not None:
+            if filesize is not None and local_stat.st_size == filesize:
+                # サイズが一致＝変更なしとみなしダウンロード済み扱い
+                return None
+            headers = {'If-Modified-Since': formatdate(local_stat.st_mtime, usegmt=True)}
+
+        opened = False
+        try:
+            async with self.client.stream('GET', url, headers=headers) as response:
+                if response.status_code == 304:
+                    # サーバー側に更新なし
+                    return None
+
+                if response.is_error:
+                    print(f"  ⚠️  添付ファイル {attachment_id} のダウンロードに失敗しました (HTTP {response.status_code})")
+                    return False
+
+                # ローカルディスクへの書き込みは短時間のためイベントループ上で行う
+                with open(file_path, 'wb') as f:
+                    opened = True
+                    async for chunk in response.aiter_bytes(1024 * 1024):
+                        f.write(chunk)
+
+            return True
+
+        except (httpx.HTTPError, OSError) as e:
+            print(f"  ⚠️  添付ファイル {attachment_id} のダウンロード中にエラーが発生しました: {str(e)}")
+            if opened:
+                # 書きかけのファイルを残すと次回サイズ一致で誤スキップしうるため削除
+                try:
+                    os.unlink(file_path)
+                except OSError:
+                    pass
+            return False
+
+    async def aclose(self) -> None:
+        """
+        クライアントの接続プールを閉じます。
+        """
+        await self.client.aclose()
+
+
+async def process_issue_async(
+    client: AsyncRedmineClient,
+    file_manager,
+    issue_id: int,
+    skip_existing: bool,
+    download_attachments: bool,
+    semaphore: asyncio.Semaphore
+) -> bool:
+    """
+    単一のチケットを非同期に処理します（取得・保存・添付ダウンロード）。
+
+    Args:
+        client (AsyncRedmineClient): 非同期Redmine APIクライアント
+        file_manager (FileManager): ファイル管理オブジェクト
+        issue_id (int): 処理するチケットID
+        skip_existing (bool): 既存ファイルをスキップするかどうか
+        download_attachments (bool): 添付ファイルをダウンロードするかどうか
+        semaphore (asyncio.Semaphore): 同時実行数を制限するセマフォ
+
+    Returns:
+        bool: 処理が成功した場合True
+    """
+    logger = logging.getLogger(__name__)
+    loop = asyncio.get_running_loop()
+
+    async with semaphore:
+        try:
+            logger.info(f"Issue {issue_id}: チケット情報を取得中...")
+            issue_data = await client.get_issue(issue_id)
+
+            if issue_data is None:
+                logger.error(f"Issue {issue_id}: チケットが見つかりません (404 Not Found)")
+                return False
+
+            # JSONの保存はブロッキングI/Oのためワーカースレッドに逃がす
+            saved_path = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    file_manager.save_issue_json, issue_id, issue_data,
+                    skip_existing=skip_existing
+                )
+            )
+            if saved_path is None:
+                logger.info(f"Issue {issue_id}: ファイルが既に存在するためスキップします")
+                return True
+            logger.info(f"Issue {issue_id}: 保存完了 -> {saved_path}")
+
+            if download_attachments:
+                attachments = [a for a in extract_attachments(issue_data) if a.get('id')]
+                if attachments:
+                    logger.info(f"Issue {issue_id}: {len(attachments)} 個の添付ファイルをダウンロード中...")
+                    results = await asyncio.gather(*(
+                        client.download_attachment(
+                            attachment['id'],
+                            file_manager.get_attachment_file_path(
+                                issue_id,
+                                attachment.get('filename', f"attachment_{attachment['id']}")
+                            ),
+                            attachment.get('filesize')
+                        )
+                        for attachment in attachments
+                    ))
+                    download_failed = sum(1 for result in results if result is False)
+
+                    if download_failed > 0:
+                        logger.warning(f"Issue {issue_id}: 添付ファイル {download_failed}/{len(attachments)} 個のダウンロードに失敗しました")
+                    else:
+                        logger.info(f"Issue {issue_id}: すべての添付ファイルのダウンロードが完了しました")
+
+            return True
+
+        except RedmineAPIError as e:
+            logger.error(f"Issue {issue_id}: API エラー - {str(e)}")
+            return False
+
+        except (OSError, ValueError) as e:
+            logger.error(f"Issue {issue_id}: ファイル保存エラー - {str(e)}")
+            return False
+
+        except Exception as e:
+            logger.error(f"Issue {issue_id}: 予期しないエラー - {str(e)}")
+            return False
+
+
+async def fetch_issues_async(
+    base_url: str,
+    api_key: str,
+    file_manager,
+    issue_ids: List[int],
+    skip_existing: bool,
+    download_attachments: bool,
+    max_concurrency: int = 32
+) -> Tuple[int, int]:
+    """
+    複数のチケットを非同期に一括処理します。
+
+    Args:
+        base_url (str): RedmineサーバーのベースURL
+        api_key (str): Redmine API キー
+        file_manager (FileManager): ファイル管理オブジェクト
+        issue_ids (List[int]): 処理するチケットIDのリスト
+        skip_existing (bool): 既存ファイルをスキップするかどうか
+        download_attachments (bool): 添付ファイルをダウンロードするかどうか
+        max_concurrency (int): チケット処理の同時実行数の上限
+
+    Returns:
+        Tuple[int, int]: (成功件数, 失敗件数)
+    """
+    client = AsyncRedmineClient(base_url, api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    try:
+        results = await asyncio.gather(*(
+            process_issue_async(
+                client, file_manager, issue_id,
+                skip_existing, download_attachments, semaphore
+            )
+            for issue_id in issue_ids
+        ))
+    finally:
+        await client.aclose()
+
+    successful_count = sum(1 for result in results if result)
+    return successful_count, len(results) - successful_count